@@ -1,16 +1,259 @@
 import os
+import sys
 import ast
+import pickle
+import hashlib
+import dataclasses
 
-from collections import Counter, defaultdict
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
-# Dictionary to store context, relationships, imports, and function call references for each file
-analysis_results = defaultdict(lambda: {
-    'context': [],
-    'relationships': set(),
-    'imports': [],
-    'function_calls': Counter(),  
-    'node_type_counts': Counter()
-})
+@dataclasses.dataclass(slots=True)
+class FileAnalysis:
+    """
+    Lightweight record holding the analysis results of a single Python file.
+
+    Attributes:
+        context (list[str]): The class names found in the file.
+        relationships (frozenset[str]): Function relationships (methods and standalone functions).
+        imports (list[str]): The modules and elements imported in the file.
+        function_calls (Counter): The frequency of function calls.
+        node_type_counts (Counter): The frequency of AST node types.
+    """
+    context: list
+    relationships: frozenset
+    imports: list
+    function_calls: Counter
+    node_type_counts: Counter
+
+class AnalysisTable:
+    """
+    Stores the analysis results of all files as parallel lists, one entry per file.
+
+    Row `i` of every list belongs to `paths[i]`, so consumers that process every file can
+    scan the lists by index instead of looking up a separate dictionary per file. For
+    callers that work with one file at a time, the table also behaves like a read-only
+    mapping from file path to a `FileAnalysis` record.
+
+    Attributes:
+        paths (list[str]): The analyzed file paths, in the order they were added.
+        contexts (list[list[str]]): The class names found in each file.
+        relationships (list[frozenset[str]]): The function and method names of each file.
+        imports (list[list[str]]): The modules and elements imported by each file.
+        function_calls (list[Counter]): The frequency of function calls in each file.
+        node_type_counts (list[Counter]): The frequency of AST node types in each file.
+    """
+
+    def __init__(self):
+        self.paths = []
+        self.contexts = []
+        self.relationships = []
+        self.imports = []
+        self.function_calls = []
+        self.node_type_counts = []
+        self._index = {}
+
+    def add(self, path, result):
+        """
+        Adds the `FileAnalysis` returned by `analyze_file` as the row for `path`,
+        replacing any existing row for the same path.
+
+        Function and import names are interned, so names that recur across files (such as
+        'os' or '__init__') share a single string object and compare by identity first.
+        This is done here rather than in `analyze_file` because results arriving from worker
+        processes or the cache are unpickled into fresh strings.
+        """
+        row = (
+            result.context,
+            frozenset(sys.intern(name) for name in result.relationships),
+            [sys.intern(name) for name in result.imports],
+            result.function_calls,
+            result.node_type_counts,
+        )
+        columns = (self.contexts, self.relationships, self.imports, self.function_calls, self.node_type_counts)
+
+        i = self._index.get(path)
+        if i is None:
+            self._index[path] = len(self.paths)
+            self.paths.append(path)
+            for column, value in zip(columns, row):
+                column.append(value)
+        else:
+            for column, value in zip(columns, row):
+                column[i] = value
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __contains__(self, path):
+        return path in self._index
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __getitem__(self, path):
+        i = self._index[path]
+        return FileAnalysis(
+            self.contexts[i],
+            self.relationships[i],
+            self.imports[i],
+            self.function_calls[i],
+            self.node_type_counts[i],
+        )
+
+    def keys(self):
+        return list(self.paths)
+
+    def items(self):
+        return [(path, self[path]) for path in self.paths]
+
+# Table storing context, relationships, imports, and function call references for each file
+analysis_results = AnalysisTable()
+
+# On-disk cache of per-file analysis results, keyed by path, modification time and size.
+# Bump CACHE_VERSION whenever the extracted data changes so stale entries are ignored.
+CACHE_DIR = os.path.join('.cache', 'task1')
+CACHE_VERSION = 5
+
+def _cache_path(file_path, stat):
+    key = (CACHE_VERSION, file_path, stat.st_mtime_ns, stat.st_size)
+    return os.path.join(CACHE_DIR, hashlib.sha1(repr(key).encode('utf-8')).hexdigest() + '.pkl')
+
+def _load_cached(cache_path):
+    try:
+        with open(cache_path, 'rb') as file:
+            context, relationships, imports, function_calls, node_type_counts = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError) as e:
+        print(f"Ignoring unreadable cache entry {cache_path}: {e}")
+        return None
+    return FileAnalysis(context, frozenset(relationships), imports, function_calls, node_type_counts)
+
+def _store_cached(cache_path, result):
+    # Entries are plain tuples rather than pickled `FileAnalysis` records, which would refer to
+    # `__main__.FileAnalysis` when this module is run as a script. Sets are stored as sorted
+    # tuples so identical results produce identical cache files.
+    cached = (
+        result.context,
+        tuple(sorted(result.relationships)),
+        result.imports,
+        result.function_calls,
+        result.node_type_counts,
+    )
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_path, 'wb') as file:
+            pickle.dump(cached, file, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        print(f"Error writing cache entry {cache_path}: {e}")
+
+# Per-node-type handlers used by `analyze_file`. Each receives the node, the name of the
+# enclosing class (or None) and the per-file collections it should update.
+def _h_func(node, current_class, relationships, context, imports, function_calls):
+    # Extract function definitions with class context
+    func_name = f"{current_class}.{node.name}" if current_class else node.name
+    relationships.add(func_name)
+
+def _h_class(node, current_class, relationships, context, imports, function_calls):
+    # Extract class definitions; `_walk` traverses the body with the class as context
+    context.append(node.name)
+
+def _h_import(node, current_class, relationships, context, imports, function_calls):
+    # Extract import statements; `imports` is a dict used as an insertion-ordered set
+    for alias in node.names:
+        imports[alias.name] = None
+
+def _h_importfrom(node, current_class, relationships, context, imports, function_calls):
+    for alias in node.names:
+        imports[f"{node.module}.{alias.name}" if node.module else alias.name] = None
+
+def _h_call(node, current_class, relationships, context, imports, function_calls):
+    # Extract function calls and count their occurrences
+    if isinstance(node.func, ast.Name):
+        function_calls[node.func.id] += 1
+    elif isinstance(node.func, ast.Attribute):
+        function_calls[node.func.attr] += 1
+
+# AST node classes are concrete, so a single type() lookup replaces a chain of isinstance checks
+HANDLERS = {
+    ast.FunctionDef: _h_func,
+    ast.ClassDef: _h_class,
+    ast.Import: _h_import,
+    ast.ImportFrom: _h_importfrom,
+    ast.Call: _h_call,
+}
+
+# Child-bearing fields, in `_fields` order, of the node classes that make up nearly all of a
+# typical tree. `_walk` reads these fields directly instead of calling `ast.iter_child_nodes`,
+# which inspects every field of every node. Leaf nodes such as contexts and operators have
+# no children at all. Only classes whose list fields never hold None are listed here; every
+# other class falls back to `ast.iter_child_nodes`.
+CHILD_FIELDS = {
+    ast.Module: ('body', 'type_ignores'),
+    ast.FunctionDef: ('args', 'body', 'decorator_list', 'returns', 'type_params'),
+    ast.arg: ('annotation',),
+    ast.Return: ('value',),
+    ast.Assign: ('targets', 'value'),
+    ast.If: ('test', 'body', 'orelse'),
+    ast.Import: ('names',),
+    ast.ImportFrom: ('names',),
+    ast.Expr: ('value',),
+    ast.BoolOp: ('op', 'values'),
+    ast.BinOp: ('left', 'op', 'right'),
+    ast.UnaryOp: ('op', 'operand'),
+    ast.Compare: ('left', 'ops', 'comparators'),
+    ast.Call: ('func', 'args', 'keywords'),
+    ast.keyword: ('value',),
+    ast.Attribute: ('value', 'ctx'),
+    ast.Subscript: ('value', 'slice', 'ctx'),
+    ast.Name: ('ctx',),
+    ast.List: ('elts', 'ctx'),
+    ast.Tuple: ('elts', 'ctx'),
+    **dict.fromkeys((ast.Constant, ast.alias, ast.Load, ast.Store, ast.Del), ()),
+    **dict.fromkeys((ast.And, ast.Or, ast.Not, ast.USub, ast.Add, ast.Sub, ast.Mult, ast.Mod), ()),
+    **dict.fromkeys((ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Is, ast.IsNot, ast.In, ast.NotIn), ()),
+}
+
+def _walk(tree):
+    """
+    Yields every node in `tree` exactly once, in source order, together with the name of
+    the class whose body encloses it (or None).
+
+    Like `ast.walk`, this is a single iterative pass, but the enclosing class is carried
+    on the work stack instead of being looked up through a parent map.
+    """
+    # Children are pushed in reverse so nodes are still visited in source order
+    stack = [(tree, None)]
+    while stack:
+        node, current_class = stack.pop()
+        yield node, current_class
+
+        # Each child of a class is visited once, in `_fields` order: the body takes the class
+        # as context, while bases, keywords, decorators and type parameters (Python 3.12+)
+        # keep the outer context
+        if type(node) is ast.ClassDef:
+            stack.extend(reversed([
+                *((child, current_class) for child in node.bases),
+                *((child, current_class) for child in node.keywords),
+                *((child, node.name) for child in node.body),
+                *((child, current_class) for child in node.decorator_list),
+                *((child, current_class) for child in getattr(node, 'type_params', ())),
+            ]))
+        else:
+            fields = CHILD_FIELDS.get(type(node))
+            if fields is None:
+                children = list(ast.iter_child_nodes(node))
+            else:
+                children = []
+                for field in fields:
+                    # Optional fields may be None; 'type_params' only exists on Python 3.12+
+                    value = getattr(node, field, None)
+                    if type(value) is list:
+                        children.extend(value)
+                    elif value is not None:
+                        children.append(value)
+            stack.extend((child, current_class) for child in reversed(children))
 
 # Function to parse a Python file and extract detailed information
 def analyze_file(file_path):
@@ -19,140 +262,125 @@ def analyze_file(file_path):
 
     This function reads a Python file, parses it into an Abstract Syntax Tree (AST),
     and traverses the tree to extract information such as class and function definitions,
-    import statements, and function call occurrences. The results are stored in a global
-    dictionary for later use in analysis or diagram generation.
+    import statements, and function call occurrences. The function does not touch any
+    global state, so it can run in a worker process. Results are cached under `CACHE_DIR`
+    and reused while the file's modification time and size are unchanged.
 
     Args:
         file_path (str): The path to the Python file to be analyzed.
 
     Returns:
-        None. The function updates the global `analysis_results` dictionary with:
+        FileAnalysis or None: None if the file could not be read or parsed, otherwise a
+        `FileAnalysis` record with:
             - 'context': A list of class names found in the file.
-            - 'relationships': A set of function relationships (methods and standalone functions).
-            - 'imports': A list of modules and elements imported in the file.
+            - 'relationships': A frozenset of function relationships (methods and standalone functions).
+            - 'imports': A list of the unique modules and elements imported in the file.
             - 'function_calls': A Counter object with the frequency of function calls.
             - 'node_type_counts': A Counter object with the frequency of AST node types.
 
     Raises:
-        Prints error messages if the file cannot be opened or parsed due to I/O errors or
-        syntax errors.
+        Prints error messages and returns None if the file cannot be opened, parsed or
+        traversed due to I/O errors, syntax errors or unexpected errors while processing it.
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
+        cache_path = _cache_path(file_path, os.stat(file_path))
+    except OSError as e:
+        print(f"Error opening file {file_path}: {e}")
+        return None
+
+    cached = _load_cached(cache_path)
+    if cached is not None:
+        return cached
+
+    # Read raw bytes and let `ast.parse` decode them, honouring any encoding declaration
+    try:
+        with open(file_path, 'rb') as file:
             code = file.read()
     except IOError as e:
         print(f"Error opening file {file_path}: {e}")
-        return
+        return None
 
     try:
-        tree = ast.parse(code)
-    except SyntaxError as e:
+        tree = ast.parse(code, filename=file_path)
+    except (SyntaxError, ValueError) as e:
+        # Undecodable source is reported as a SyntaxError, null bytes as a ValueError
         print(f"Syntax error in file {file_path}: {e}")
-        return
+        return None
 
     relationships = set()
     context = []
-    imports = []
+    imports = {}  # Ordered set, so repeated imports are only listed once
     function_calls = Counter()  # Use Counter for frequency analysis
     node_type_counts = Counter()
 
-    def traverse_node(node, current_class=None):
-        try:
-            # Count the node type
-            node_type_counts[type(node).__name__] += 1
-
-            # Extract function definitions with class context
-            if isinstance(node, ast.FunctionDef):
-                func_name = f"{current_class}.{node.name}" if current_class else node.name
-                relationships.add(func_name)
-
-            # Extract class definitions and traverse its body
-            if isinstance(node, ast.ClassDef):
-                context.append(node.name)
-                for child in node.body:
-                    traverse_node(child, current_class=node.name)
-
-            # Extract import statements
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append(alias.name)
-
-            if isinstance(node, ast.ImportFrom):
-                for alias in node.names:
-                    imports.append(f"{node.module}.{alias.name}" if node.module else alias.name)
-
-            # Extract function calls and count their occurrences
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name):
-                    function_calls[node.func.id] += 1
-                elif isinstance(node.func, ast.Attribute):
-                    function_calls[node.func.attr] += 1
-
-            # Recursively process child nodes
-            for child in ast.iter_child_nodes(node):
-                traverse_node(child, current_class)
-        except Exception as e:
-            print(f"Error processing node in file {file_path}: {e}")
-    
-    traverse_node(tree)
-    analysis_results[file_path] = {
-        'context': context,
-        'relationships': filter_class_methods(relationships),
-        'imports': imports,
-        'function_calls': function_calls,
-        'node_type_counts': node_type_counts
-    }
-    
-def filter_class_methods(relationships):
-    """
-    Filters out standalone method names from the relationships set if their class-qualified
-    counterparts exist.
+    # A single handler around the whole walk keeps the per-node work to one lookup and one
+    # dispatch. Any failure in here is a bug rather than bad input, so the partial results are
+    # dropped instead of being returned and cached.
+    try:
+        for node, current_class in _walk(tree):
+            node_type = type(node)
 
-    This function identifies methods that are both standalone and part of a class and removes
-    the standalone version when a class-qualified version exists. This helps maintain clarity
-    by ensuring that only the class-specific representation is kept when both forms are present.
+            # Count the node type, keyed by class; names are resolved once after the walk
+            node_type_counts[node_type] += 1
 
-    Args:
-        relationships (set): A set containing method names, both standalone (e.g., 'method_name')
-                             and class-qualified (e.g., 'ClassName.method_name').
+            handler = HANDLERS.get(node_type)
+            if handler:
+                handler(node, current_class, relationships, context, imports, function_calls)
+    except Exception as e:
+        print(f"Error processing {file_path}: {e}")
+        return None
 
-    Returns:
-        set: A filtered set containing only the class-qualified method names and standalone
-             method names that do not have a class-qualified counterpart.
-    """
-    # Create a set to store standalone method names
-    standalone_methods = {method for method in relationships if '.' not in method}
-    
-    # Create a set to store class-qualified method names
-    class_methods = {method.split('.')[-1] for method in relationships if '.' in method}
-
-    # Remove standalone methods that are associated with a class-qualified method
-    filtered_relationships = {
-        method for method in relationships
-        if '.' in method or method not in class_methods
-    }
-    
-    return filtered_relationships
-
-def analyze_codebase(directory_path):
+    node_type_counts = Counter({node_type.__name__: count for node_type, count in node_type_counts.items()})
+
+    result = FileAnalysis(
+        context=context,
+        relationships=frozenset(relationships),
+        imports=list(imports),
+        function_calls=function_calls,
+        node_type_counts=node_type_counts
+    )
+    _store_cached(cache_path, result)
+    return result
+
+def analyze_codebase(directory_path, parallel=True):
     """
     Analyzes all Python files in a given directory and its subdirectories.
 
-    This function walks through a directory tree, identifies Python files, and calls
-    the `analyze_file` function on each one to extract structural information and
-    update the global `analysis_results` dictionary with details from each file.
+    This function walks through a directory tree, collects the Python files, and runs
+    the `analyze_file` function on each one, by default in a pool of worker processes, to
+    extract structural information. The `FileAnalysis` of each file that was analyzed
+    successfully is added as a row of the global `analysis_results` table.
+
+    With the 'spawn' and 'forkserver' start methods (the defaults on macOS, Windows and
+    Python 3.14+ on Linux), every worker starts by re-importing the main script. A parallel
+    run must therefore only be started from code under an `if __name__ == "__main__":`
+    guard, or the workers would run the script's top-level code, and this analysis, again.
 
     Args:
         directory_path (str): The path to the directory containing Python files to be analyzed.
+        parallel (bool): Whether to analyze the files in worker processes. Defaults to True.
+                         Pass False when calling from code that is not guarded as above.
 
     Returns:
-        None. The function iterates through the directory and calls `analyze_file` on each
-        Python file, storing analysis results globally.
+        None. The function stores the analysis results of each Python file globally.
     """
-    for root, _, files in os.walk(directory_path):
-        for file in files:
-            if file.endswith('.py'):
-                analyze_file(os.path.join(root, file))
+    paths = [
+        os.path.join(root, file)
+        for root, _, files in os.walk(directory_path)
+        for file in files
+        if file.endswith('.py')
+    ]
+
+    if parallel:
+        # Parsing is CPU-bound, so files are spread over processes rather than threads
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(analyze_file, paths, chunksize=8))
+    else:
+        results = map(analyze_file, paths)
+
+    for path, result in zip(paths, results):
+        if result is not None:
+            analysis_results.add(path, result)
 
 def compare_and_print_common_functions(analysis_results):
     """
@@ -163,40 +391,55 @@ def compare_and_print_common_functions(analysis_results):
     functions, it prints them; otherwise, it indicates that there are no common functions.
 
     Args:
-        analysis_results (dict): A dictionary where each key is a file path, and the value
-                                 is a dictionary containing analysis details, including
-                                 'relationships' which is a set of function names.
+        analysis_results (AnalysisTable): The analysis results, whose `relationships` list
+                                          holds the set of function names of each file.
 
     Returns:
         str: A message indicating the common functions between the first two files or
-             stating that there are no common functions. If there is a KeyError, it returns
-             an error message.
+             stating that there are no common functions.
     """
-    keys = list(analysis_results.keys())
-    if len(keys) > 1:
-        try:
-            common_functions = analysis_results[keys[0]]['relationships'].intersection(analysis_results[keys[1]]['relationships'])
-            if common_functions:
-                return f"\nCommon functions between '{os.path.basename(keys[0])}' and '{os.path.basename(keys[1])}': {common_functions}"
-            else:
-                return f"\nThere are no common functions between '{os.path.basename(keys[0])}' and '{os.path.basename(keys[1])}'."
-        except KeyError as e:
-            return f"Error comparing functions: {e}"
+    paths = analysis_results.paths
+    if len(paths) > 1:
+        common_functions = analysis_results.relationships[0] & analysis_results.relationships[1]
+        if common_functions:
+            return f"\nCommon functions between '{os.path.basename(paths[0])}' and '{os.path.basename(paths[1])}': {set(common_functions)}"
+        else:
+            return f"\nThere are no common functions between '{os.path.basename(paths[0])}' and '{os.path.basename(paths[1])}'."
     else:
         return "Not enough files to compare functions."
 
-codebase_path = './codebase_files'
-analyze_codebase(codebase_path)
-
-# Print summary of analysis
-print("\nSummary of analysis:")
-for file, data in analysis_results.items():
-    print(f"\nFile: {file}")
-    print(f"\nContext (Classes): {data['context']}")
-    print(f"\nRelationships (Functions): {data['relationships']}")
-    print(f"\nImports: {data['imports']}")
-    print(f"\nFunction Calls (with Frequencies): {dict(data['function_calls'])}")
-    print(f"\nNode Type Counts: {dict(data['node_type_counts'])}")
-
-common_functions = compare_and_print_common_functions(analysis_results)
-print(f"\nCommon functions: {common_functions}")
+def get_analysis_results(path='./codebase_files'):
+    """
+    Returns the analysis results of the codebase, analyzing it first if that has not happened yet.
+
+    This is the entry point for the other tasks: importing this module no longer analyzes the
+    codebase, so the analysis only runs when the results are needed, and files that have not
+    changed since the last run are loaded from the on-disk cache.
+
+    Args:
+        path (str): The path to the directory containing Python files to be analyzed.
+                    Defaults to './codebase_files'.
+
+    Returns:
+        AnalysisTable: The global `analysis_results` table.
+    """
+    if not analysis_results:
+        analyze_codebase(path)
+    return analysis_results
+
+if __name__ == "__main__":
+    codebase_path = './codebase_files'
+    analyze_codebase(codebase_path)
+
+    # Print summary of analysis
+    print("\nSummary of analysis:")
+    for file, data in analysis_results.items():
+        print(f"\nFile: {file}")
+        print(f"\nContext (Classes): {data.context}")
+        print(f"\nRelationships (Functions): {set(data.relationships)}")
+        print(f"\nImports: {data.imports}")
+        print(f"\nFunction Calls (with Frequencies): {dict(data.function_calls)}")
+        print(f"\nNode Type Counts: {dict(data.node_type_counts)}")
+
+    common_functions = compare_and_print_common_functions(analysis_results)
+    print(f"\nCommon functions: {common_functions}")
@@ -1,36 +1,31 @@
 import os
+import re
 import json
+import asyncio
 import openai
 
 from dotenv import load_dotenv
 from prompts import prompt_template
-from task_1 import analysis_results, common_functions
+from task_1 import get_analysis_results, compare_and_print_common_functions
 
 load_dotenv()
 
-# Set up OpenAI API key
-OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
-
-if not OPENAI_API_KEY:
-    print("Error: OPENAI_API_KEY is not set in the environment.")
-    exit(1)
-
-openai.api_key = OPENAI_API_KEY
-
-def create_prompt(file_key, question, analysis_results):
+def create_prompt(file_key, question, analysis_results, common_functions):
     """
     Creates a formatted prompt using data from a specific Python file's analysis results.
 
     This function extracts context (classes), relationships (functions/methods), and imports
-    for a given Python file from the `analysis_results` dictionary. It formats these details
-    along with a given question into a prompt using a predefined template.
+    for a given Python file from its `FileAnalysis` in the `analysis_results` table. It formats
+    these details along with a given question into a prompt using a predefined template.
 
     Args:
-        file_key (str): The key representing the file path in the `analysis_results` dictionary.
+        file_key (str): The path of the file in the `analysis_results` table.
         question (str): The question or instruction to include in the prompt.
-        analysis_results (dict): A dictionary where each key is a file path, and the value
-                                 is a dictionary containing analysis details such as 'context',
-                                 'relationships', and 'imports'.
+        analysis_results (AnalysisTable): The analysis results, mapping each file path to a
+                                          `FileAnalysis` with details such as 'context',
+                                          'relationships', and 'imports'.
+        common_functions (set): The functions shared by the analyzed files, as returned by
+                                `compare_and_print_common_functions`.
 
     Returns:
         str or None: A formatted prompt string containing the file name, context, relationships,
@@ -43,10 +38,11 @@ def create_prompt(file_key, question, analysis_results):
     try:
         file_name = os.path.basename(file_key)  # Extract just the file name for display
         # Extract relevant data for the specific .py file mentioned
+        file_analysis = analysis_results[file_key]
         analysis_data = {
-            "context": ", ".join(analysis_results[file_key]["context"]),
-            "relationships": ", ".join(analysis_results[file_key]["relationships"]),
-            "imports": ", ".join(analysis_results[file_key]["imports"])  # Join imports into a single string
+            "context": ", ".join(file_analysis.context),
+            "relationships": ", ".join(file_analysis.relationships),
+            "imports": ", ".join(file_analysis.imports)  # Join imports into a single string
         }
         # Format the prompt with the extracted data and the question
         return prompt_template.format(
@@ -54,100 +50,196 @@ def create_prompt(file_key, question, analysis_results):
             context=analysis_data["context"] if analysis_data["context"] else "No classes",
             relationships=analysis_data["relationships"] if analysis_data["relationships"] else "No functions/methods",
             imports=analysis_data["imports"] if analysis_data["imports"] else "No imports",
-            common_functions = common_functions,
+            common_functions=common_functions,
             question=question
         )
     except KeyError as e:
         print(f"Key error: {e} - Check the structure of the analysis results or file_key.")
         return None
 
-def ask_question_and_save(question):
+async def ask_batch(prompts, api_key):
+    """
+    Sends several prompts to the OpenAI GPT-4 model concurrently.
+
+    All requests share one client, so its HTTP connections are reused instead of being set up
+    again for every prompt.
+
+    Args:
+        prompts (list[str]): The prompts to send to the OpenAI GPT-4 model.
+        api_key (str): The OpenAI API key used to authenticate the requests.
+
+    Returns:
+        list: For each prompt, in the same order, either the answer (str) or the exception raised
+              by its request, so that one failed request does not discard the other answers.
     """
-    Sends a question to the OpenAI GPT-4 model and saves the response to a JSON file.
+    async with openai.AsyncOpenAI(api_key=api_key) as client:
+        responses = await asyncio.gather(*[
+            client.chat.completions.create(
+                model="gpt-4",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0
+            )
+            for prompt in prompts
+        ], return_exceptions=True)
+
+    return [
+        response if isinstance(response, Exception) else response.choices[0].message.content
+        for response in responses
+    ]
+
+def ask_questions_and_save(prompts, user_questions, api_key, question_number=0):
+    """
+    Sends prompts to the OpenAI GPT-4 model in one batch and saves each response to a JSON file.
 
-    This function interacts with the OpenAI API to get a response for a given question.
-    It increments a global question counter, sends the question to the model, and saves
-    both the question and the response to a JSON file in an 'output' directory.
+    This function sends all prompts to the OpenAI API at once using `ask_batch`. For every
+    answer it increments the question counter and saves both the user's question and the
+    response to a JSON file in an 'output' directory.
 
     Args:
-        question (str): The question or prompt to send to the OpenAI GPT-4 model.
+        prompts (list[str]): The prompts to send to the OpenAI GPT-4 model.
+        user_questions (list[str]): The questions as entered by the user, one per prompt.
+        api_key (str): The OpenAI API key used to authenticate the requests.
+        question_number (int): The number of the last saved question; the first answer is saved
+                               as question `question_number + 1`. Defaults to 0.
 
     Returns:
-        None. The function prints a success message when the response is saved and an error
-        message if there is a failure.
+        int: The number of the last saved question, to be passed in as `question_number` on the
+             next call. The function prints a success message when a response is saved and an
+             error message if there is a failure.
 
     Raises:
-        Exception: Prints an error message if the request to OpenAI API fails or if there is
+        Exception: Prints an error message if a request to OpenAI API fails or if there is
                    an issue with file operations (e.g., writing to a file).
     """
 
-    global question_number
-    question_number += 1  # Increment the counter for each new question
     try:
-        # Call the OpenAI API
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": question}],
-            temperature=0  
-        )
-        answer = response['choices'][0]['message']['content']
-        # answer = "manually written"
-        
+        answers = asyncio.run(ask_batch(prompts, api_key))
+    except Exception as e:
+        print(f"Failed to retrieve responses: {e}")
+        return question_number
 
-        # Ensure the output folder exists
-        os.makedirs('output', exist_ok=True)
+    # Ensure the output folder exists
+    os.makedirs('output', exist_ok=True)
 
-        # Construct the filename using the incremented counter
-        output_filename = f'output/question_{question_number}.json'
+    for user_question, answer in zip(user_questions, answers):
+        if isinstance(answer, Exception):
+            print(f"Failed to retrieve response for '{user_question}': {answer}")
+            continue
 
-        # Save the response in a JSON file
-        with open(output_filename, 'w', encoding='utf-8') as f:
-            json.dump({"question": user_input, "answer": answer}, f, ensure_ascii=False, indent=4)
+        question_number += 1  # Increment the counter for each new question
+        try:
+            # Construct the filename using the incremented counter
+            output_filename = f'output/question_{question_number}.json'
 
-        print(f"Response has been saved in '{output_filename}'.")
-    except Exception as e:
-        print(f"Failed to save or retrieve response: {e}")
+            # Save the response in a JSON file
+            with open(output_filename, 'w', encoding='utf-8') as f:
+                json.dump({"question": user_question, "answer": answer}, f, ensure_ascii=False, indent=4)
+
+            print(f"Response has been saved in '{output_filename}'.")
+        except Exception as e:
+            print(f"Failed to save response: {e}")
 
-def process_user_question(user_question):
+    return question_number
+
+def build_file_name_pattern(analysis_results):
     """
-    Processes a user question to find the relevant Python file and generates a prompt for OpenAI.
+    Builds the lookup used to find which analyzed Python file a question refers to.
 
-    This function searches through the `analysis_results` dictionary to find a matching Python file
-    based on the filename mentioned in the `user_question`. If a matching file is found, it calls
-    `create_prompt` to generate a prompt with analysis details and then sends it to OpenAI using
-    `ask_question_and_save`.
+    This function maps the lowercase file name of every file in `analysis_results` to its path,
+    keeping the first path for duplicate names, and compiles one case-insensitive pattern that
+    finds any of these names in a question. Longer names come first in the pattern so a name is
+    never shadowed by a shorter one it contains.
 
     Args:
-        user_question (str): The question or input provided by the user that should refer to a
-                             specific Python file (e.g., 'api.py' or 'app.py').
+        analysis_results (AnalysisTable): The analysis results, keyed by file path.
 
     Returns:
-        None. The function prints an error message if no matching file is found or if the question
-        is not associated with a specific file.
+        tuple: A `(file_paths_by_name, file_name_pattern)` pair, where `file_paths_by_name` is a
+               dict mapping each lowercase file name to its path and `file_name_pattern` is the
+               compiled pattern, or `None` if there are no analyzed files.
+    """
+    file_paths_by_name = {}
+    for file_path in analysis_results:
+        file_paths_by_name.setdefault(os.path.basename(file_path).lower(), file_path)
+
+    file_name_pattern = re.compile(
+        r'\b(' + '|'.join(map(re.escape, sorted(file_paths_by_name, key=len, reverse=True))) + r')\b',
+        re.IGNORECASE
+    ) if file_paths_by_name else None
+    return file_paths_by_name, file_name_pattern
+
+def process_user_questions(user_questions, analysis_results, common_functions, api_key, question_number=0):
+    """
+    Processes user questions to find the relevant Python files and generates prompts for OpenAI.
+
+    For each question, this function scans it once with the pattern from
+    `build_file_name_pattern` to find the Python file from `analysis_results` whose filename is
+    mentioned in it. If a matching file is found,
+    it calls `create_prompt` to generate a prompt with analysis details. All prompts are then
+    sent to OpenAI together using `ask_questions_and_save`.
+
+    Args:
+        user_questions (list[str]): The questions or inputs provided by the user, each of which
+                                    should refer to a specific Python file (e.g., 'api.py' or
+                                    'app.py').
+        analysis_results (AnalysisTable): The analysis results, keyed by file path.
+        common_functions (set): The functions shared by the analyzed files, as returned by
+                                `compare_and_print_common_functions`.
+        api_key (str): The OpenAI API key used to authenticate the requests.
+        question_number (int): The number of the last saved question. Defaults to 0.
+
+    Returns:
+        int: The number of the last saved question. The function prints an error message if no
+             matching file is found or if a question is not associated with a specific file.
 
     Raises:
         None explicitly, but prints an error if the `file_key` is not found or if `create_prompt`
         returns `None`.
     """
-    file_key = None
-    for file_path in analysis_results.keys():
-        file_name = os.path.basename(file_path).lower()
-        if file_name in user_question.lower():
-            file_key = file_path
-            break
-
-    if not file_key:
-        print("Error: The question must refer to a specific .py file (e.g., 'api.py' or 'app.py').")
-
-
-    prompt = create_prompt(file_key, user_question, analysis_results)
-    if prompt:
-        ask_question_and_save(prompt)
-
-# Initialize a static counter
-question_number = 0
-try:
-    user_input = input("Please enter your question: ")
-    process_user_question(user_input)
-except Exception as e:
-    print(f"An error occurred while processing the question: {e}")
+    file_paths_by_name, file_name_pattern = build_file_name_pattern(analysis_results)
+    prompts = []
+    asked_questions = []
+    for user_question in user_questions:
+        match = file_name_pattern.search(user_question) if file_name_pattern else None
+        file_key = file_paths_by_name[match.group(1).lower()] if match else None
+
+        # Only successfully analyzed files are in `analysis_results`, so a question that does
+        # not name one of them has no data to build a prompt from
+        if not file_key:
+            print("Error: The question must refer to a specific .py file (e.g., 'api.py' or 'app.py').")
+            continue
+
+        prompt = create_prompt(file_key, user_question, analysis_results, common_functions)
+        if prompt:
+            prompts.append(prompt)
+            asked_questions.append(user_question)
+
+    if prompts:
+        question_number = ask_questions_and_save(prompts, asked_questions, api_key, question_number)
+    return question_number
+
+if __name__ == "__main__":
+    # Set up OpenAI API key
+    OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
+
+    if not OPENAI_API_KEY:
+        print("Error: OPENAI_API_KEY is not set in the environment.")
+        exit(1)
+
+    analysis_results = get_analysis_results()
+    common_functions = compare_and_print_common_functions(analysis_results)
+
+    try:
+        # Collect questions until an empty line (or the end of input) so they can be sent to
+        # OpenAI in a single batch
+        user_inputs = []
+        try:
+            user_input = input("Please enter your question: ")
+            while user_input.strip():
+                user_inputs.append(user_input)
+                user_input = input("Please enter another question (or press Enter to finish): ")
+        except EOFError:
+            pass
+        process_user_questions(user_inputs, analysis_results, common_functions, OPENAI_API_KEY)
+    except Exception as e:
+        print(f"An error occurred while processing the question: {e}")
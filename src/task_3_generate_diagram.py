@@ -1,7 +1,7 @@
 import os
 
 from collections import defaultdict
-from task_1 import analysis_results
+from task_1 import get_analysis_results
 
 
 # Sample analysis_results input for demonstration
@@ -18,21 +18,43 @@ from task_1 import analysis_results
 #     }
 # }
 
+def _bucket(relationships):
+    """
+    Splits function names into per-class method lists and standalone functions in one pass.
+
+    Args:
+        relationships (set): Function and method names, e.g. 'ClassName.method_name' or 'func'.
+
+    Returns:
+        tuple: A dict mapping each class name to the names of its methods, and a list of the
+               standalone function names.
+    """
+    buckets = defaultdict(list)
+    standalone_functions = []
+    for func in relationships:
+        cls, sep, name = func.partition('.')
+        if sep:
+            buckets[cls].append(name)
+        else:
+            standalone_functions.append(cls)
+    return buckets, standalone_functions
+
 def generate_mermaid_class_diagram(analysis_results):
     """
     Generates a Mermaid class diagram from the analysis results of a Python codebase.
 
-    This function constructs a Mermaid class diagram by iterating through the `analysis_results`
-    dictionary, creating class representations with their methods, and indicating standalone
-    functions and import relationships. The generated diagram can be visualized using Mermaid
-    diagram tools.
+    This function constructs a Mermaid class diagram by scanning the parallel per-file lists of
+    the `analysis_results` table, creating class representations with their methods, and
+    indicating standalone functions and import relationships. The lines of the diagram are
+    collected in a list and joined once at the end. The generated diagram can be visualized
+    using Mermaid diagram tools.
 
     Args:
-        analysis_results (dict): A dictionary where each key is a file path, and the value
-                                 is a dictionary containing analysis details, including:
-                                 - 'context': List of class names in the file.
-                                 - 'relationships': Set of function and method names.
-                                 - 'imports': List of modules imported in the file.
+        analysis_results (AnalysisTable): The analysis results, holding parallel lists with
+                                          one entry per file, including:
+                                          - 'contexts': List of class names in the file.
+                                          - 'relationships': Set of function and method names.
+                                          - 'imports': List of modules imported in the file.
 
     Returns:
         str: A formatted Mermaid class diagram string representing the structure of the analyzed
@@ -41,49 +63,48 @@ def generate_mermaid_class_diagram(analysis_results):
     Raises:
         None explicitly, but the function assumes that `analysis_results` is well-formed.
     """
-    diagram = "classDiagram\n"
-    
-    for filepath, details in analysis_results.items():
-        filename = os.path.splitext(os.path.basename(filepath))[0]
+    lines = ["classDiagram"]
+
+    paths = analysis_results.paths
+    contexts = analysis_results.contexts
+    relationships = analysis_results.relationships
+    imports = analysis_results.imports
+
+    for i in range(len(paths)):
+        filename = os.path.splitext(os.path.basename(paths[i]))[0]
+        buckets, standalone_functions = _bucket(relationships[i])
 
         # Add classes and their methods
-        if details['context']:
-            for cls in details['context']:
-                diagram += f"    class {cls} {{\n"
-                # Add only methods that belong to this class
-                for func in details['relationships']:
-                    if func.startswith(f"{cls}."):
-                        method_name = func.split('.')[-1]
-                        diagram += f"        +{method_name}()\n"
-                diagram += "    }\n"
-
-            # Add a relationship from the file class to the class it contains
-            diagram += f"    {filename} -- {details['context'][0]} : contains\n"
+        for cls in contexts[i]:
+            lines.append(f"    class {cls} {{")
+            lines.extend(f"        +{method_name}()" for method_name in buckets.get(cls, ()))
+            lines.append("    }")
+
+        # Add a relationship from the file class to the class it contains
+        if contexts[i]:
+            lines.append(f"    {filename} -- {contexts[i][0]} : contains")
 
         # Represent standalone functions that are not part of any class
-        standalone_functions = [
-            func for func in details['relationships']
-            if '.' not in func
-        ]
         if standalone_functions:
-            diagram += f"    class {filename} {{\n"
-            for func in standalone_functions:
-                diagram += f"        +{func}()\n"
-            diagram += "    }\n"
-        
-        # Add import relationships
-        for imp in details['imports']:
-            imp_clean = imp.split('.')[-1]  # Get the module name only
-            diagram += f"    {filename} ..> {imp_clean} : imports\n"
-
-    return diagram
-
-# Generate the Mermaid class diagram from analysis_results
-mermaid_diagram = generate_mermaid_class_diagram(analysis_results)
-print(mermaid_diagram)
-
-# Save the diagram to a .mmd file for visualization
-with open('mermaid_class_diagram_manual.mmd', 'w', encoding='utf-8') as file:
-    file.write(mermaid_diagram)
-
-print("Mermaid diagram has been saved to 'mermaid_class_diagram_manual.mmd'.")
+            lines.append(f"    class {filename} {{")
+            lines.extend(f"        +{func}()" for func in standalone_functions)
+            lines.append("    }")
+
+        # Add one import relationship per imported module, using the module name only
+        modules = dict.fromkeys(imp.split('.')[-1] for imp in imports[i])
+        lines.extend(f"    {filename} ..> {module} : imports" for module in modules)
+
+    return "\n".join(lines) + "\n"
+
+if __name__ == "__main__":
+    analysis_results = get_analysis_results()
+
+    # Generate the Mermaid class diagram from analysis_results
+    mermaid_diagram = generate_mermaid_class_diagram(analysis_results)
+    print(mermaid_diagram)
+
+    # Save the diagram to a .mmd file for visualization
+    with open('mermaid_class_diagram_manual.mmd', 'w', encoding='utf-8') as file:
+        file.write(mermaid_diagram)
+
+    print("Mermaid diagram has been saved to 'mermaid_class_diagram_manual.mmd'.")
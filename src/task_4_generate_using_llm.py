@@ -3,35 +3,48 @@ import json
 import openai
 
 from dotenv import load_dotenv
-from task_1 import analysis_results
+from task_1 import get_analysis_results
 
 load_dotenv()
 
-# Set up OpenAI API key
-OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
-
-if not OPENAI_API_KEY:
-    print("Error: OPENAI_API_KEY is not set in the environment.")
-    exit(1)
-
-openai.api_key = OPENAI_API_KEY
-
-# Convert set objects in analysis_results to lists for JSON serialization
-serializable_results = {
-    filepath: {
-        'context': details['context'],
-        'relationships': list(details['relationships']),  # Convert set to list
-        'imports': details['imports']
-    }
-    for filepath, details in analysis_results.items()
-}
-
-try:
-    # Serialize the updated structure for the prompt
-    analysis_summary = json.dumps(serializable_results, indent=2)
-
-    # Refine the prompt for GPT-4
-    prompt_generate_diagram = f"""
+class _SetEncoder(json.JSONEncoder):
+    """JSON encoder that writes sets and frozensets as lists, so they need not be copied first."""
+
+    def default(self, o):
+        if isinstance(o, (set, frozenset)):
+            return list(o)
+        return super().default(o)
+
+if __name__ == "__main__":
+    # Set up OpenAI API key
+    OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
+
+    if not OPENAI_API_KEY:
+        print("Error: OPENAI_API_KEY is not set in the environment.")
+        exit(1)
+
+    client = openai.OpenAI(api_key=OPENAI_API_KEY)
+
+    analysis_results = get_analysis_results()
+
+    try:
+        # Serialize the fields needed for the prompt straight from the analysis table columns
+        analysis_summary = json.dumps({
+            filepath: {
+                'context': context,
+                'relationships': relationships,
+                'imports': imports
+            }
+            for filepath, context, relationships, imports in zip(
+                analysis_results.paths,
+                analysis_results.contexts,
+                analysis_results.relationships,
+                analysis_results.imports
+            )
+        }, indent=2, cls=_SetEncoder)
+
+        # Refine the prompt for GPT-4
+        prompt_generate_diagram = f"""
     Given the following analysis results from a Python codebase, generate a Mermaid class diagram with the following requirements:
 
     1. Each Python file should be represented as a class only if it contains standalone functions or when no classes are present.
@@ -47,33 +60,33 @@ try:
     Ensure that imports are shown as relationships (e.g., `file ..> module`) and not as members inside the class.
     """
 
-    # Call OpenAI's GPT-4 model to generate the diagram
-    response = openai.ChatCompletion.create(
-        model="gpt-4",
-        messages=[{"role": "user", "content": prompt_generate_diagram}]
-    )
-
-    # Extract and print the Mermaid diagram
-    mermaid_diagram = response['choices'][0]['message']['content']
-    print(mermaid_diagram)
-
-    # Verify that the diagram matches expectations
-    if 'classDiagram' not in mermaid_diagram:
-        raise ValueError("The generated output does not contain a valid Mermaid class diagram structure.")
-
-    # Save the generated Mermaid diagram to a file
-    with open('mermaid_diagram_from_gpt.mmd', 'w', encoding='utf-8') as file:
-        file.write(mermaid_diagram)
-
-    print("Mermaid diagram has been saved to 'mermaid_diagram_from_gpt.mmd'.")
-
-except json.JSONDecodeError as e:
-    print(f"JSON serialization error: {e}")
-except openai.error.OpenAIError as e:
-    print(f"OpenAI API error: {e}")
-except IOError as e:
-    print(f"File operation error: {e}")
-except ValueError as e:
-    print(f"Validation error: {e}")
-except Exception as e:
-    print(f"An unexpected error occurred: {e}")
+        # Call OpenAI's GPT-4 model to generate the diagram
+        response = client.chat.completions.create(
+            model="gpt-4",
+            messages=[{"role": "user", "content": prompt_generate_diagram}]
+        )
+
+        # Extract and print the Mermaid diagram
+        mermaid_diagram = response.choices[0].message.content
+        print(mermaid_diagram)
+
+        # Verify that the diagram matches expectations
+        if 'classDiagram' not in mermaid_diagram:
+            raise ValueError("The generated output does not contain a valid Mermaid class diagram structure.")
+
+        # Save the generated Mermaid diagram to a file
+        with open('mermaid_diagram_from_gpt.mmd', 'w', encoding='utf-8') as file:
+            file.write(mermaid_diagram)
+
+        print("Mermaid diagram has been saved to 'mermaid_diagram_from_gpt.mmd'.")
+
+    except json.JSONDecodeError as e:
+        print(f"JSON serialization error: {e}")
+    except openai.OpenAIError as e:
+        print(f"OpenAI API error: {e}")
+    except IOError as e:
+        print(f"File operation error: {e}")
+    except ValueError as e:
+        print(f"Validation error: {e}")
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")